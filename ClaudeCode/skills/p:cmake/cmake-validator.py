@@ -9,13 +9,17 @@ Usage:
     python3 cmake-validator.py [file_or_directory]
     python3 cmake-validator.py CMakeLists.txt
     python3 cmake-validator.py src/
+    python3 cmake-validator.py --cache .cmake-validator-cache.json src/
 """
 
+import hashlib
+import json
+import os
 import sys
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from enum import Enum
 
 
@@ -25,8 +29,7 @@ class Severity(Enum):
     INFO = "INFO"
 
 
-@dataclass
-class Issue:
+class Issue(NamedTuple):
     severity: Severity
     line_num: int
     line: str
@@ -35,129 +38,181 @@ class Issue:
     suggestion: str
 
 
+# Legacy patterns to detect. Patterns are matched against the whole file in
+# MULTILINE mode, so they use [^\S\n] (any whitespace except a newline, same as
+# \s within a single line) rather than \s to stay within one line.
+_RAW_PATTERNS = {
+    # Global include directories (should be target-based)
+    r'^[^\S\n]*include_directories[^\S\n]*\(': {
+        'name': 'include_directories()',
+        'severity': Severity.WARNING,
+        'message': 'Using global include_directories() - affects all targets',
+        'suggestion': 'Use target_include_directories(target PRIVATE/PUBLIC ...)',
+        'exceptions': []
+    },
+
+    # Global link libraries (should be target-based)
+    r'^[^\S\n]*link_libraries[^\S\n]*\(': {
+        'name': 'link_libraries()',
+        'severity': Severity.ERROR,
+        'message': 'Using global link_libraries() - affects all targets',
+        'suggestion': 'Use target_link_libraries(target PRIVATE/PUBLIC ...)',
+        'exceptions': []
+    },
+
+    # Global definitions (should be target-based)
+    r'^[^\S\n]*add_definitions[^\S\n]*\(': {
+        'name': 'add_definitions()',
+        'severity': Severity.WARNING,
+        'message': 'Using global add_definitions() - affects all targets',
+        'suggestion': 'Use target_compile_definitions(target PRIVATE/PUBLIC ...)',
+        'exceptions': []
+    },
+
+    # Global compile options without target
+    r'^[^\S\n]*add_compile_options[^\S\n]*\(': {
+        'name': 'add_compile_options()',
+        'severity': Severity.INFO,
+        'message': 'Using global add_compile_options() - consider target-specific flags',
+        'suggestion': 'Use target_compile_options(target PRIVATE/PUBLIC ...) for target-specific flags',
+        'exceptions': ['early in file', 'before first target']
+    },
+
+    # Using CMAKE_C_FLAGS directly (legacy)
+    r'^[^\S\n]*set[^\S\n]*\([^\S\n]*CMAKE_C_FLAGS': {
+        'name': 'CMAKE_C_FLAGS',
+        'severity': Severity.INFO,
+        'message': 'Directly setting CMAKE_C_FLAGS - consider target-specific flags',
+        'suggestion': 'Use target_compile_options() or add_compile_options() instead',
+        'exceptions': []
+    },
+
+    # Missing PRIVATE/PUBLIC/INTERFACE in target commands
+    r'^[^\S\n]*target_(?:link_libraries|include_directories|compile_options|compile_definitions)[^\S\n]*\([^\S\n]*\w+[^\S\n]+\$\{': {
+        'name': 'Missing visibility keyword',
+        'severity': Severity.WARNING,
+        'message': 'target_* command may be missing PRIVATE/PUBLIC/INTERFACE keyword',
+        'suggestion': 'Add PRIVATE, PUBLIC, or INTERFACE visibility keyword',
+        'exceptions': []
+    },
+
+    # Using -static flag on macOS (will fail). The lookahead consumes only the
+    # flag, so patterns later on the same line are still found.
+    r'-static(?=.*APPLE)': {
+        'name': '-static on macOS',
+        'severity': Severity.ERROR,
+        'message': 'Using -static flag on macOS will fail (libSystem must be dynamic)',
+        'suggestion': 'Use CMAKE_FIND_LIBRARY_SUFFIXES .a instead of -static on macOS',
+        'exceptions': []
+    },
+
+    # Not using REQUIRED for critical dependencies
+    r'find_package[^\S\n]*\([^\S\n]*\w+[^\S\n]*\)(?![^\S\n]*(?:REQUIRED|#))': {
+        'name': 'find_package without REQUIRED',
+        'severity': Severity.INFO,
+        'message': 'find_package() without REQUIRED or explicit handling',
+        'suggestion': 'Add REQUIRED or check ${PACKAGE}_FOUND explicitly',
+        'exceptions': ['optional']
+    },
+}
+
+
+# All patterns compiled once into a single alternation; the name of the group
+# that matched (p0, p1, ...) selects the pattern info
+_INFO_BY_GROUP = {
+    f'p{index}': {**info, 'exceptions_lower': [e.lower() for e in info['exceptions']]}
+    for index, info in enumerate(_RAW_PATTERNS.values())
+}
+
+_MASTER_RE = re.compile('|'.join(
+    f'(?P<p{index}>{pattern_str})' for index, pattern_str in enumerate(_RAW_PATTERNS)
+), re.MULTILINE)
+
+# Cached results are only valid for the pattern set that produced them
+_PATTERNS_FINGERPRINT = hashlib.blake2b(repr(_RAW_PATTERNS).encode(), digest_size=16).hexdigest()
+
+
 class CMakeValidator:
     """Validates CMakeLists.txt for legacy patterns"""
 
-    # Legacy patterns to detect
-    PATTERNS = {
-        # Global include directories (should be target-based)
-        r'^\s*include_directories\s*\(': {
-            'name': 'include_directories()',
-            'severity': Severity.WARNING,
-            'message': 'Using global include_directories() - affects all targets',
-            'suggestion': 'Use target_include_directories(target PRIVATE/PUBLIC ...)',
-            'exceptions': []
-        },
-
-        # Global link libraries (should be target-based)
-        r'^\s*link_libraries\s*\(': {
-            'name': 'link_libraries()',
-            'severity': Severity.ERROR,
-            'message': 'Using global link_libraries() - affects all targets',
-            'suggestion': 'Use target_link_libraries(target PRIVATE/PUBLIC ...)',
-            'exceptions': []
-        },
-
-        # Global definitions (should be target-based)
-        r'^\s*add_definitions\s*\(': {
-            'name': 'add_definitions()',
-            'severity': Severity.WARNING,
-            'message': 'Using global add_definitions() - affects all targets',
-            'suggestion': 'Use target_compile_definitions(target PRIVATE/PUBLIC ...)',
-            'exceptions': []
-        },
-
-        # Global compile options without target
-        r'^\s*add_compile_options\s*\(': {
-            'name': 'add_compile_options()',
-            'severity': Severity.INFO,
-            'message': 'Using global add_compile_options() - consider target-specific flags',
-            'suggestion': 'Use target_compile_options(target PRIVATE/PUBLIC ...) for target-specific flags',
-            'exceptions': ['early in file', 'before first target']
-        },
-
-        # Using CMAKE_C_FLAGS directly (legacy)
-        r'^\s*set\s*\(\s*CMAKE_C_FLAGS': {
-            'name': 'CMAKE_C_FLAGS',
-            'severity': Severity.INFO,
-            'message': 'Directly setting CMAKE_C_FLAGS - consider target-specific flags',
-            'suggestion': 'Use target_compile_options() or add_compile_options() instead',
-            'exceptions': []
-        },
-
-        # Missing PRIVATE/PUBLIC/INTERFACE in target commands
-        r'^\s*target_(?:link_libraries|include_directories|compile_options|compile_definitions)\s*\(\s*\w+\s+\$\{': {
-            'name': 'Missing visibility keyword',
-            'severity': Severity.WARNING,
-            'message': 'target_* command may be missing PRIVATE/PUBLIC/INTERFACE keyword',
-            'suggestion': 'Add PRIVATE, PUBLIC, or INTERFACE visibility keyword',
-            'exceptions': []
-        },
-
-        # Using -static flag on macOS (will fail)
-        r'-static.*APPLE': {
-            'name': '-static on macOS',
-            'severity': Severity.ERROR,
-            'message': 'Using -static flag on macOS will fail (libSystem must be dynamic)',
-            'suggestion': 'Use CMAKE_FIND_LIBRARY_SUFFIXES .a instead of -static on macOS',
-            'exceptions': []
-        },
-
-        # Not using REQUIRED for critical dependencies
-        r'find_package\s*\(\s*\w+\s*\)(?!\s*(?:REQUIRED|#))': {
-            'name': 'find_package without REQUIRED',
-            'severity': Severity.INFO,
-            'message': 'find_package() without REQUIRED or explicit handling',
-            'suggestion': 'Add REQUIRED or check ${PACKAGE}_FOUND explicitly',
-            'exceptions': ['optional']
-        },
-    }
+    PATTERNS = _RAW_PATTERNS
 
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
         self.issues: List[Issue] = []
 
-    def validate_file(self, filepath: Path) -> List[Issue]:
-        """Validate a single CMakeLists.txt file"""
-        self.issues = []
-
+    def validate_file(self, filepath: Path) -> Optional[List[Issue]]:
+        """Validate a single CMakeLists.txt file; None if it could not be read"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            with open(filepath, 'rb') as f:
+                data = f.read()
         except Exception as e:
             print(f"Error reading {filepath}: {e}", file=sys.stderr)
-            return []
+            return None
+
+        return self.validate_content(filepath, data)
 
-        for line_num, line in enumerate(lines, start=1):
-            # Skip comments
-            if line.strip().startswith('#'):
+    def validate_content(self, filepath: Path, data: bytes) -> Optional[List[Issue]]:
+        """Validate the raw bytes of a file; None if they are not valid UTF-8"""
+        self.issues = []
+
+        try:
+            # Same newline handling as reading the file in text mode
+            content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        except UnicodeDecodeError as e:
+            print(f"Error reading {filepath}: {e}", file=sys.stderr)
+            return None
+
+        # Scan the whole file at once; line numbers and line text are only
+        # recovered for the (few) positions where a pattern matched
+        line_num = 1
+        line_start = 0
+        line_end = 0
+        line = ''
+        line_lower = ''
+        is_comment = False
+        seen = set()
+
+        for match in _MASTER_RE.finditer(content):
+            start = match.start()
+
+            if start >= line_end:
+                line_num += content.count('\n', line_start, start)
+                line_start = content.rfind('\n', 0, start) + 1
+                line_end = content.find('\n', start)
+                if line_end < 0:
+                    line_end = len(content)
+                line = content[line_start:line_end]
+                line_lower = line.lower()
+                # Skip comments
+                stripped = line.lstrip()
+                is_comment = not stripped or stripped[0] == '#'
+                seen = set()
+
+            group = match.lastgroup
+            if is_comment or group in seen:
                 continue
+            seen.add(group)
 
-            self._check_line(line_num, line)
+            self._check_line(line_num, line, line_lower, _INFO_BY_GROUP[group])
 
         return self.issues
 
-    def _check_line(self, line_num: int, line: str):
-        """Check a single line for legacy patterns"""
-        for pattern_str, info in self.PATTERNS.items():
-            if re.search(pattern_str, line):
-                # Check exceptions
-                skip = False
-                for exception in info['exceptions']:
-                    if exception.lower() in line.lower():
-                        skip = True
-                        break
-
-                if not skip:
-                    issue = Issue(
-                        severity=info['severity'],
-                        line_num=line_num,
-                        line=line.strip(),
-                        pattern=info['name'],
-                        message=info['message'],
-                        suggestion=info['suggestion']
-                    )
-                    self.issues.append(issue)
+    def _check_line(self, line_num: int, line: str, line_lower: str, info: dict):
+        """Record a pattern match on a line unless an exception applies"""
+        # Check exceptions
+        if any(exception in line_lower for exception in info['exceptions_lower']):
+            return
+
+        issue = Issue(
+            severity=info['severity'],
+            line_num=line_num,
+            line=line.strip(),
+            pattern=info['name'],
+            message=info['message'],
+            suggestion=info['suggestion']
+        )
+        self.issues.append(issue)
 
     def print_report(self, filepath: Path, issues: List[Issue]):
         """Print validation report"""
@@ -165,76 +220,206 @@ class CMakeValidator:
             print(f"✓ {filepath}: No issues found")
             return
 
-        print(f"\n{'=' * 80}")
-        print(f"File: {filepath}")
-        print(f"{'=' * 80}\n")
+        out = [f"\n{'=' * 80}\n", f"File: {filepath}\n", f"{'=' * 80}\n\n"]
 
         # Group by severity
-        errors = [i for i in issues if i.severity == Severity.ERROR]
-        warnings = [i for i in issues if i.severity == Severity.WARNING]
-        infos = [i for i in issues if i.severity == Severity.INFO]
+        buckets = {Severity.ERROR: [], Severity.WARNING: [], Severity.INFO: []}
+        for issue in issues:
+            buckets[issue.severity].append(issue)
+        errors = buckets[Severity.ERROR]
+        warnings = buckets[Severity.WARNING]
+        infos = buckets[Severity.INFO]
 
         for issue_list, label in [(errors, "ERRORS"), (warnings, "WARNINGS"), (infos, "INFO")]:
             if not issue_list:
                 continue
 
-            print(f"{label}:")
-            print("-" * 80)
+            out.append(f"{label}:\n")
+            out.append("-" * 80 + "\n")
 
             for issue in issue_list:
-                print(f"\nLine {issue.line_num}: {issue.pattern}")
-                print(f"  {issue.line}")
-                print(f"  ⚠ {issue.message}")
-                print(f"  ✓ {issue.suggestion}")
+                out.append(f"\nLine {issue.line_num}: {issue.pattern}\n")
+                out.append(f"  {issue.line}\n")
+                out.append(f"  ⚠ {issue.message}\n")
+                out.append(f"  ✓ {issue.suggestion}\n")
+
+        out.append(f"\n{'=' * 80}\n")
+        out.append(f"Summary: {len(errors)} errors, {len(warnings)} warnings, {len(infos)} info\n")
+        out.append(f"{'=' * 80}\n\n")
+
+        sys.stdout.write("".join(out))
+
 
-        print(f"\n{'=' * 80}")
-        print(f"Summary: {len(errors)} errors, {len(warnings)} warnings, {len(infos)} info")
-        print(f"{'=' * 80}\n")
+def _walk(path: str):
+    """Yield CMakeLists.txt and .cmake files under path in a single tree walk"""
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return
 
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from _walk(entry.path)
+        elif entry.name == "CMakeLists.txt" or entry.name.endswith(".cmake"):
+            if entry.is_file():
+                yield entry.path
 
-def find_cmake_files(path: Path) -> List[Path]:
-    """Find all CMakeLists.txt and .cmake files in path"""
+
+def iter_cmake_files(path: Path):
+    """Yield CMakeLists.txt and .cmake files in path as they are found"""
     if path.is_file():
         # Accept CMakeLists.txt or any .cmake file
         if path.name == "CMakeLists.txt" or path.suffix == ".cmake":
-            return [path]
-        return []
+            yield path
+
+    elif path.is_dir():
+        # Find both CMakeLists.txt and *.cmake files (one walk, no duplicates)
+        for filepath in _walk(str(path)):
+            yield Path(filepath)
 
-    if path.is_dir():
-        # Find both CMakeLists.txt and *.cmake files
-        cmake_files = list(path.rglob("CMakeLists.txt"))
-        cmake_files.extend(path.rglob("*.cmake"))
-        return sorted(set(cmake_files))  # Remove duplicates
 
-    return []
+def _validate_one(filepath: Path, data: Optional[bytes] = None) -> Tuple[Path, Optional[List[Issue]]]:
+    """Validate one file in a worker process, from data if it was already read"""
+    validator = CMakeValidator()
+    if data is None:
+        return filepath, validator.validate_file(filepath)
+    return filepath, validator.validate_content(filepath, data)
+
+
+def _read_bytes(filepath: Path) -> Optional[bytes]:
+    """Raw file content, or None if unreadable (the worker then reports the error)"""
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _content_key(data: bytes) -> str:
+    """Digest of the file content, used as cache key"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _load_cache(cache_path: Path) -> Dict[str, list]:
+    """Load cached issues keyed by content digest; unreadable or stale caches are ignored"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(cache, dict) or cache.get('patterns') != _PATTERNS_FINGERPRINT:
+        return {}
+
+    return cache.get('files', {})
+
+
+def _save_cache(cache_path: Path, files: Dict[str, list]):
+    """Write the cache atomically, keeping only entries for files seen in this run"""
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'patterns': _PATTERNS_FINGERPRINT, 'files': files}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not write cache {cache_path}: {e}", file=sys.stderr)
+
+
+def _issue_to_json(issue: Issue) -> dict:
+    return {**issue._asdict(), 'severity': issue.severity.value}
+
+
+def _issue_from_json(data: dict) -> Issue:
+    return Issue(**{**data, 'severity': Severity(data['severity'])})
 
 
 def main():
-    if len(sys.argv) < 2:
-        # Default to current directory
-        search_path = Path.cwd()
-    else:
-        search_path = Path(sys.argv[1])
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Detect legacy CMake patterns in CMakeLists.txt and .cmake files"
+    )
+    parser.add_argument(
+        "path",
+        nargs="?",
+        type=Path,
+        default=Path.cwd(),
+        help="File or directory to validate (default: current directory)"
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        help="JSON cache of results keyed by file content; unchanged files are not re-scanned"
+    )
+
+    args = parser.parse_args()
+    search_path = args.path
 
     if not search_path.exists():
         print(f"Error: Path '{search_path}' does not exist", file=sys.stderr)
         sys.exit(1)
 
-    # Find all CMakeLists.txt and .cmake files
-    cmake_files = find_cmake_files(search_path)
+    cache = _load_cache(args.cache) if args.cache else None
+    cache_out = {}
+    results = []
+    pending = []
+
+    # Find all CMakeLists.txt and .cmake files and validate them. Files are
+    # independent, so inside a directory each one is handed to a worker as
+    # soon as the walk finds it; reports are printed from this process in
+    # path order so output stays deterministic.
+    executor = None
+    if not search_path.is_file():
+        sys.stdout.flush()  # don't let forked workers inherit buffered output
+        executor = ProcessPoolExecutor()
+
+    try:
+        for filepath in iter_cmake_files(search_path):
+            # With a cache, the file is read once here: the digest and the
+            # scan in the worker use the same bytes
+            data = _read_bytes(filepath) if cache is not None else None
+            key = _content_key(data) if data is not None else None
+
+            if key is not None and key in cache:
+                cache_out[key] = cache[key]
+                results.append((filepath, [_issue_from_json(d) for d in cache[key]]))
+            elif executor is not None:
+                pending.append((key, executor.submit(_validate_one, filepath, data)))
+            else:
+                pending.append((key, _validate_one(filepath, data)))
+
+        for key, result in pending:
+            if executor is not None:
+                result = result.result()
+            filepath, issues = result
+            # A file that could not be read is reported again on the next
+            # run, never cached as clean
+            if issues is None:
+                results.append((filepath, []))
+                continue
+            results.append(result)
+            if key is not None:
+                cache_out[key] = [_issue_to_json(i) for i in issues]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if args.cache:
+        _save_cache(args.cache, cache_out)
+
+    results.sort(key=lambda result: result[0])
 
-    if not cmake_files:
+    if not results:
         print(f"No CMakeLists.txt or .cmake files found in {search_path}")
         sys.exit(0)
 
-    print(f"Validating {len(cmake_files)} CMake file(s)...\n")
+    print(f"Validating {len(results)} CMake file(s)...\n")
 
     validator = CMakeValidator()
     total_issues = 0
     total_errors = 0
 
-    for filepath in cmake_files:
-        issues = validator.validate_file(filepath)
+    for filepath, issues in results:
         total_issues += len(issues)
         total_errors += len([i for i in issues if i.severity == Severity.ERROR])
 
@@ -7,24 +7,44 @@ Usage: python3 get_implementation_plan.py [path_to_requirements.yaml]
 import re
 import sys
 import os
+from pathlib import Path
+
+_HEADER = re.compile(r'^[a-z_]+:')
+
+def read_sections(yaml_file, wanted):
+    """Collect the raw text of the wanted top-level sections in one pass"""
+
+    sections = {}
+    current = None
+    buf = []
+
+    with open(yaml_file, 'r') as f:
+        for line in f:
+            header = _HEADER.match(line)
+            if header:
+                if current in wanted:
+                    sections.setdefault(current, ''.join(buf))
+                current = header.group()[:-1]
+                buf = [line[header.end():]]
+            elif current in wanted:
+                buf.append(line)
+
+    if current in wanted:
+        sections.setdefault(current, ''.join(buf))
+
+    return sections
 
 def extract_implementation_plan(yaml_file):
     """Extract only implementation_plan, complete flag, and success_criteria"""
 
-    with open(yaml_file, 'r') as f:
-        content = f.read()
+    sections = read_sections(yaml_file, {'complete', 'implementation_plan', 'success_criteria'})
 
     # Extract complete flag
-    complete_match = re.search(r'^complete:\s*(.+)$', content, re.MULTILINE)
-    complete = complete_match.group(1).strip() if complete_match else "false"
-
-    # Extract implementation_plan section
-    impl_match = re.search(r'^implementation_plan:(.*?)(?=^[a-z_]+:|\Z)', content, re.MULTILINE | re.DOTALL)
-    implementation_plan = impl_match.group(1).strip() if impl_match else ""
+    complete = sections.get('complete', '').split('\n', 1)[0].strip() or "false"
 
-    # Extract success_criteria section
-    success_match = re.search(r'^success_criteria:(.*?)(?=^[a-z_]+:|\Z)', content, re.MULTILINE | re.DOTALL)
-    success_criteria = success_match.group(1).strip() if success_match else ""
+    # Extract implementation_plan and success_criteria sections
+    implementation_plan = sections.get('implementation_plan', '').strip()
+    success_criteria = sections.get('success_criteria', '').strip()
 
     # Output compact YAML
     print(f"complete: {complete}")
@@ -37,25 +57,23 @@ def extract_implementation_plan(yaml_file):
         print("implementation_plan:")
         print(implementation_plan)
 
+def find_requirements_upwards(start, levels=5):
+    """Return the nearest requirements.yaml in start or its parents (up to levels dirs)"""
+
+    for directory in [start, *start.parents][:levels]:
+        candidate = directory / 'requirements.yaml'
+        if candidate.is_file():
+            return str(candidate)
+    return None
+
 def main():
     # Default to requirements.yaml in current directory or parent directories
-    yaml_file = None
-
     if len(sys.argv) > 1:
-        yaml_file = sys.argv[1]
+        yaml_file = sys.argv[1] if os.path.exists(sys.argv[1]) else None
     else:
-        current_dir = os.getcwd()
-        for _ in range(5):
-            candidate = os.path.join(current_dir, 'requirements.yaml')
-            if os.path.exists(candidate):
-                yaml_file = candidate
-                break
-            parent = os.path.dirname(current_dir)
-            if parent == current_dir:
-                break
-            current_dir = parent
-
-    if not yaml_file or not os.path.exists(yaml_file):
+        yaml_file = find_requirements_upwards(Path.cwd())
+
+    if not yaml_file:
         print("Error: requirements.yaml not found", file=sys.stderr)
         sys.exit(1)
 
@@ -4,41 +4,46 @@ Display raw YAML blocks for specific tasks from requirements.yaml file.
 Usage: python3 show_task_details.py task-001 task-002 task-003 ...
 """
 
+import contextlib
+import mmap
 import re
 import sys
 import os
+from pathlib import Path
 
-def find_task_yaml_block(content, task_id):
-    """Find and extract the raw YAML block for a specific task"""
+# Byte patterns: the file is scanned through mmap and never decoded as a whole
+_TASK_RE = re.compile(rb'^    - task_id:\s*(\S+)', re.MULTILINE)
+# (\r? so CRLF files, which text mode used to translate, still match)
+_SECTION_END_RE = re.compile(rb'\r?\n\r?\n(?:implementation_notes|future_enhancements|constraints|success_criteria):')
 
-    # Find the task block
-    pattern = rf'    - task_id:\s*{re.escape(task_id)}\b'
-    match = re.search(pattern, content)
+def index_task_blocks(content):
+    """Map every task_id (bytes) to the (start, end) span of its raw YAML block in one scan"""
 
-    if not match:
-        return None
+    matches = list(_TASK_RE.finditer(content))
+    spans = {}
 
-    # Find the start position (beginning of the line with task_id)
-    start_pos = match.start()
+    for i, match in enumerate(matches):
+        start_pos = match.start()
 
-    # Find where this task ends (next task_id at same indentation level or end of tasks section)
-    next_task_pattern = r'\n    - task_id:'
-    next_task = re.search(next_task_pattern, content[start_pos + 10:])
+        # A task ends where the next one starts, the last one at the end of the tasks section
+        if i + 1 < len(matches):
+            end_pos = matches[i + 1].start()
+        else:
+            end_match = _SECTION_END_RE.search(content, start_pos)
+            end_pos = end_match.start() if end_match else len(content)
+
+        spans.setdefault(match.group(1), (start_pos, end_pos))
+
+    return spans
 
-    if next_task:
-        end_pos = start_pos + 10 + next_task.start()
-    else:
-        # Look for end of tasks section
-        end_markers = [r'\n\nimplementation_notes:', r'\n\nfuture_enhancements:', r'\n\nconstraints:', r'\n\nsuccess_criteria:']
-        end_pos = len(content)
-        for marker in end_markers:
-            marker_match = re.search(marker, content[start_pos:])
-            if marker_match:
-                end_pos = min(end_pos, start_pos + marker_match.start())
+def find_requirements_upwards(start, levels=5):
+    """Return the nearest requirements.yaml in start or its parents (up to levels dirs)"""
 
-    # Extract the raw YAML block
-    yaml_block = content[start_pos:end_pos].rstrip()
-    return yaml_block
+    for directory in [start, *start.parents][:levels]:
+        candidate = directory / 'requirements.yaml'
+        if candidate.is_file():
+            return str(candidate)
+    return None
 
 def main():
     if len(sys.argv) < 2:
@@ -51,35 +56,31 @@ def main():
     task_ids = sys.argv[1:]
 
     # Find requirements.yaml in current directory or parent directories
-    yaml_file = None
-    current_dir = os.getcwd()
-
-    for _ in range(5):  # Check up to 5 levels up
-        candidate = os.path.join(current_dir, 'requirements.yaml')
-        if os.path.exists(candidate):
-            yaml_file = candidate
-            break
-        parent = os.path.dirname(current_dir)
-        if parent == current_dir:  # Reached root
-            break
-        current_dir = parent
+    yaml_file = find_requirements_upwards(Path.cwd())
 
     if not yaml_file:
         print("Error: requirements.yaml not found in current directory or parent directories")
         sys.exit(1)
 
-    with open(yaml_file, 'r') as f:
-        content = f.read()
-
     found_tasks = []
     not_found_tasks = []
 
-    for task_id in task_ids:
-        yaml_block = find_task_yaml_block(content, task_id)
-        if yaml_block:
-            found_tasks.append((task_id, yaml_block))
-        else:
-            not_found_tasks.append(task_id)
+    with open(yaml_file, 'rb') as f, (
+        contextlib.nullcontext(b'')  # mmap refuses empty files
+        if os.fstat(f.fileno()).st_size == 0
+        else mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    ) as content:
+        spans = index_task_blocks(content)
+
+        for task_id in task_ids:
+            span = spans.get(task_id.encode('utf-8'))
+            if span:
+                # Extract the raw YAML block, decoding only this slice and
+                # translating newlines as text mode would
+                yaml_block = content[span[0]:span[1]].decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+                found_tasks.append((task_id, yaml_block.rstrip()))
+            else:
+                not_found_tasks.append(task_id)
 
     # Display all found tasks
     for task_id, yaml_block in found_tasks:
@@ -7,6 +7,26 @@ Usage: python3 show_tasks.py /path/to/requirements.yaml
 import re
 import sys
 
+# A line is either a category header or a task_id entry; category wins if both
+_ENTRY_RE = re.compile(
+    r'^(?:.*?# (?P<category>(?:CATEGORY|PHASE) \d+: [^#\n]+)|.*?    - task_id:[ \t]*(?P<task_id>\S+))',
+    re.MULTILINE
+)
+_DESC_RE = re.compile(r'description:[ \t]*(.+)')
+_STATUS_RE = re.compile(r'^(?!.*description:).*?status:[ \t]*(\w+)', re.MULTILINE)
+
+_STATUS_ICONS = {
+    "completed": "✅",
+    "in_progress": "🚧",
+    "cancel": "❌",
+    "pending": "⏳"
+}
+
+def _line_end(text, pos):
+    """Return the offset just past the line containing pos"""
+    end = text.find('\n', pos)
+    return len(text) if end < 0 else end + 1
+
 def show_tasks(yaml_file):
     """Parse and display tasks from requirements.yaml"""
 
@@ -21,66 +41,51 @@ def show_tasks(yaml_file):
 
     tasks_text = tasks_match.group(1)
 
-    print("=" * 120)
-    print(f"{'Task ID':<30} | {'Status':<15} | {'Description':<70}")
-    print("=" * 120)
-
-    current_category = None
     tasks_list = []
-
-    # Split into lines and parse
-    lines = tasks_text.split('\n')
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-
+    out = [
+        "=" * 120,
+        f"{'Task ID':<30} | {'Status':<15} | {'Description':<70}",
+        "=" * 120,
+    ]
+
+    # Category headers and task lines in file order, found in one sweep
+    for entry in _ENTRY_RE.finditer(tasks_text):
         # Check for category headers (CATEGORY or PHASE)
-        if '# CATEGORY' in line or '# PHASE' in line or '===' in line:
-            category_match = re.search(r'# ((?:CATEGORY|PHASE) \d+: [^#\n]+)', line)
-            if category_match:
-                current_category = category_match.group(1).strip()
-                if tasks_list:  # Print previous category's tasks if any
-                    print()
-                print(f"\n{current_category}")
-                print("-" * 120)
-
-        # Check for task entries
-        elif '    - task_id:' in line:
-            task_id_match = re.search(r'task_id:\s*(\S+)', line)
-            if task_id_match:
-                task_id = task_id_match.group(1)
-
-                # Look ahead for description and status
-                description = None
-                status = "pending"
-
-                for j in range(i+1, min(i+10, len(lines))):
-                    if 'description:' in lines[j]:
-                        desc_match = re.search(r'description:\s*(.+)', lines[j])
-                        if desc_match:
-                            description = desc_match.group(1).strip()
-                    elif 'status:' in lines[j]:
-                        status_match = re.search(r'status:\s*(\w+)', lines[j])
-                        if status_match:
-                            status = status_match.group(1)
-                    elif '    - task_id:' in lines[j]:
-                        break
-
-                if description:
-                    status_icon = {
-                        "completed": "✅",
-                        "in_progress": "🚧",
-                        "cancel": "❌",
-                        "pending": "⏳"
-                    }.get(status, "⏳")
-
-                    desc_short = description[:68] + "..." if len(description) > 68 else description
-                    print(f"{task_id:<30} | {status_icon} {status:<12} | {desc_short:<70}")
-                    tasks_list.append((task_id, status))
-
-        i += 1
-
-    print("=" * 120)
+        if entry.group('category'):
+            current_category = entry.group('category').strip()
+            if tasks_list:  # Print previous category's tasks if any
+                out.append("")
+            out.append(f"\n{current_category}")
+            out.append("-" * 120)
+            continue
+
+        # Task entry: look ahead up to 9 lines, stopping at the next task
+        task_id = entry.group('task_id')
+        window_start = _line_end(tasks_text, entry.end())
+        window_end = window_start
+        for _ in range(9):
+            window_end = _line_end(tasks_text, window_end)
+        window = tasks_text[window_start:window_end]
+
+        next_task = window.find('    - task_id:')
+        if next_task >= 0:
+            window = window[:window.rfind('\n', 0, next_task) + 1]
+
+        description = None
+        status = "pending"
+        for desc_match in _DESC_RE.finditer(window):
+            description = desc_match.group(1).strip()
+        for status_match in _STATUS_RE.finditer(window):
+            status = status_match.group(1)
+
+        if description:
+            status_icon = _STATUS_ICONS.get(status, "⏳")
+
+            desc_short = description[:68] + "..." if len(description) > 68 else description
+            out.append(f"{task_id:<30} | {status_icon} {status:<12} | {desc_short:<70}")
+            tasks_list.append((task_id, status))
+
+    out.append("=" * 120)
 
     # Summary statistics
     total = len(tasks_list)
@@ -89,16 +94,18 @@ def show_tasks(yaml_file):
     pending = sum(1 for _, status in tasks_list if status == "pending")
     cancelled = sum(1 for _, status in tasks_list if status == "cancel")
 
-    print(f"\n📊 Summary: {completed}/{total} tasks completed")
-    print(f"   ✅ Completed: {completed}")
-    print(f"   🚧 In Progress: {in_progress}")
-    print(f"   ⏳ Pending: {pending}")
+    out.append(f"\n📊 Summary: {completed}/{total} tasks completed")
+    out.append(f"   ✅ Completed: {completed}")
+    out.append(f"   🚧 In Progress: {in_progress}")
+    out.append(f"   ⏳ Pending: {pending}")
     if cancelled > 0:
-        print(f"   ❌ Cancelled: {cancelled}")
+        out.append(f"   ❌ Cancelled: {cancelled}")
 
     if total > 0:
         percentage = (completed / total) * 100
-        print(f"   Progress: {percentage:.1f}%")
+        out.append(f"   Progress: {percentage:.1f}%")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     if len(sys.argv) != 2:
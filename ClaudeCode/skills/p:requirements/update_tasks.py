@@ -8,6 +8,10 @@ Example: python3 update_tasks.py completed task-001 task-002 task-003
 import re
 import sys
 
+_ANY_TASK_ID_RE = re.compile(r'^\s*-?\s*task_id:')
+_TOP_LEVEL_RE = re.compile(r'^\w+:')
+_STATUS_VALUE_RE = re.compile(r'\w+')
+
 def update_task_status(yaml_file, status, task_ids):
     """Update status for multiple tasks in requirements.yaml"""
 
@@ -21,35 +25,40 @@ def update_task_status(yaml_file, status, task_ids):
     with open(yaml_file, 'r') as f:
         lines = f.readlines()
 
+    # Locate all requested task_id lines in one pass (first occurrence wins)
+    alternatives = "|".join(map(re.escape, task_ids))
+    task_id_re = re.compile(rf'^\s*-?\s*task_id:\s*({alternatives})\s*$')
+    task_line = {}
+    for i, line in enumerate(lines):
+        match = task_id_re.match(line)
+        if match:
+            task_line.setdefault(match.group(1), i)
+
     # Track updates
     updated = []
     not_found = []
 
     for task_id in task_ids:
-        task_found = False
-
-        # Find the task and update its status line
-        for i in range(len(lines)):
-            # Look for task_id line
-            if re.match(rf'^\s*-?\s*task_id:\s*{re.escape(task_id)}\s*$', lines[i]):
-                task_found = True
-
-                # Find the status line within the next 10 lines
-                for j in range(i + 1, min(i + 11, len(lines))):
-                    # Check if we've hit the next task or end of tasks section
-                    if re.match(r'^\s*-?\s*task_id:', lines[j]) or re.match(r'^\w+:', lines[j]):
-                        break
-
-                    # Found status line, update it
-                    if re.match(r'^\s+status:\s*\w+\s*$', lines[j]):
-                        indent = re.match(r'^(\s+)status:', lines[j]).group(1)
-                        lines[j] = f"{indent}status: {status}\n"
-                        updated.append(task_id)
-                        break
+        i = task_line.get(task_id)
+        if i is None:
+            not_found.append(task_id)
+            continue
+
+        # Find the status line within the next 10 lines
+        for j in range(i + 1, min(i + 11, len(lines))):
+            # Check if we've hit the next task or end of tasks section
+            if _ANY_TASK_ID_RE.match(lines[j]) or _TOP_LEVEL_RE.match(lines[j]):
                 break
 
-        if not task_found:
-            not_found.append(task_id)
+            # Found status line, update it
+            stripped = lines[j].lstrip()
+            if len(stripped) < len(lines[j]) and stripped.startswith('status:'):
+                value = stripped.split(':', 1)[1].strip()
+                if _STATUS_VALUE_RE.fullmatch(value):
+                    indent = lines[j][:len(lines[j]) - len(stripped)]
+                    lines[j] = f"{indent}status: {status}\n"
+                    updated.append(task_id)
+                    break
 
     # Write back
     if updated:
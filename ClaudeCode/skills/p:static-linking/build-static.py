@@ -12,12 +12,104 @@ Usage:
     python3 build-static.py --clean --verify
 """
 
+import dataclasses
+import hashlib
+import importlib.util
+import json
+import os
 import sys
 import subprocess
 import platform
+import re
 import shutil
+import stat
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List
+
+# Name fragments of build outputs that are not binaries to verify
+_SKIP_RE = re.compile(r'cmake|test|\.so|\.dylib|\.a', re.IGNORECASE)
+
+# Configure output lines worth echoing as a summary
+_CMAKE_SUMMARY_RE = re.compile(r'^.*(?:Build|Compiler|Platform|Found|enabled|disabled).*$', re.MULTILINE)
+
+_PLATFORM = platform.system()
+
+# Static linking configure flags and the note printed for them, per platform
+_PLATFORM_CONFIGURE = {
+    "Linux": (
+        ["-DCMAKE_FIND_LIBRARY_SUFFIXES=.a", "-DCMAKE_EXE_LINKER_FLAGS=-static"],
+        "🐧 Linux: Configuring for full static linking",
+    ),
+    "Darwin": (
+        ["-DCMAKE_FIND_LIBRARY_SUFFIXES=.a"],
+        "🍎 macOS: Configuring for hybrid static linking (third-party libs static)",
+    ),
+    "Windows": (
+        ["-DCMAKE_MSVC_RUNTIME_LIBRARY=MultiThreaded"],
+        "🪟 Windows: Configuring for static runtime (/MT)",
+    ),
+}
+
+# Verification results of unchanged binaries, kept in the build directory
+_VERIFY_CACHE_NAME = ".verify-cache.json"
+
+
+def _load_verifier(verifier_script: Path):
+    """Import verify-static-linking.py, which has no importable module name"""
+    spec = importlib.util.spec_from_file_location("verify_static_linking", verifier_script)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _rmtree(path: str):
+    """Worker for clean(): remove one subtree, leaving leftovers to the final pass"""
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _script_digest(script: Path) -> str:
+    """Digest of the verifier source; a changed verifier invalidates the cache"""
+    return hashlib.blake2b(script.read_bytes(), digest_size=16).hexdigest()
+
+
+def _load_verify_cache(cache_path: Path, fingerprint: str) -> Dict[str, dict]:
+    """Load cached results keyed by binary path; unreadable or stale caches are ignored"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(cache, dict) or cache.get('verifier') != fingerprint:
+        return {}
+
+    return cache.get('binaries', {})
+
+
+def _save_verify_cache(cache_path: Path, fingerprint: str, binaries: Dict[str, dict]):
+    """Write the cache atomically, keeping only entries for binaries seen in this run"""
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'verifier': fingerprint, 'binaries': binaries}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not write cache {cache_path}: {e}", file=sys.stderr)
+
+
+def _result_to_json(result) -> dict:
+    return {**dataclasses.asdict(result), 'status': result.status.name, 'binary': str(result.binary)}
+
+
+def _result_from_json(verifier, data: dict):
+    return verifier.VerificationResult(**{
+        **data,
+        'status': verifier.Status[data['status']],
+        'binary': Path(data['binary']),
+        'dependencies': [verifier.Dependency(**d) for d in data['dependencies']],
+    })
 
 
 class StaticBuilder:
@@ -34,12 +126,22 @@ class StaticBuilder:
         self.build_dir = build_dir
         self.build_type = build_type
         self.verbose = verbose
-        self.platform = platform.system()
+        self.platform = _PLATFORM
+        self._platform_args, self._platform_note = _PLATFORM_CONFIGURE.get(self.platform, ([], None))
 
     def clean(self):
         """Clean build directory"""
         if self.build_dir.exists():
             print(f"🧹 Cleaning {self.build_dir}...")
+
+            # Remove the top-level subtrees (CMakeFiles, per-target dirs)
+            # concurrently; the final rmtree deletes the rest and reports errors
+            with os.scandir(self.build_dir) as entries:
+                subtrees = [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+            if len(subtrees) > 1:
+                sys.stdout.flush()  # Don't let forked workers repeat buffered output
+                with ProcessPoolExecutor(max_workers=min(len(subtrees), os.cpu_count() or 1)) as executor:
+                    list(executor.map(_rmtree, subtrees))
             shutil.rmtree(self.build_dir)
             print("✓ Build directory cleaned\n")
 
@@ -59,24 +161,9 @@ class StaticBuilder:
         ]
 
         # Platform-specific flags
-        if self.platform == "Linux":
-            cmake_args.extend([
-                "-DCMAKE_FIND_LIBRARY_SUFFIXES=.a",
-                "-DCMAKE_EXE_LINKER_FLAGS=-static",
-            ])
-            print("🐧 Linux: Configuring for full static linking")
-
-        elif self.platform == "Darwin":
-            cmake_args.extend([
-                "-DCMAKE_FIND_LIBRARY_SUFFIXES=.a",
-            ])
-            print("🍎 macOS: Configuring for hybrid static linking (third-party libs static)")
-
-        elif self.platform == "Windows":
-            cmake_args.extend([
-                "-DCMAKE_MSVC_RUNTIME_LIBRARY=MultiThreaded",
-            ])
-            print("🪟 Windows: Configuring for static runtime (/MT)")
+        cmake_args.extend(self._platform_args)
+        if self._platform_note:
+            print(self._platform_note)
 
         if self.verbose:
             cmake_args.append("--debug-output")
@@ -93,9 +180,8 @@ class StaticBuilder:
 
             if not self.verbose and result.stdout:
                 # Print summary
-                for line in result.stdout.splitlines():
-                    if any(keyword in line for keyword in ["Build", "Compiler", "Platform", "Found", "enabled", "disabled"]):
-                        print(f"  {line}")
+                for line in _CMAKE_SUMMARY_RE.findall(result.stdout):
+                    print(f"  {line}")
 
             print("\n✓ Configuration successful\n")
             return True
@@ -124,15 +210,20 @@ class StaticBuilder:
 
         if jobs:
             cmake_args.extend(["--parallel", str(jobs)])
+        elif os.environ.get("CMAKE_BUILD_PARALLEL_LEVEL"):
+            # CMake reads it itself, but only when --parallel is absent: a
+            # bare --parallel means the native tool's default (unlimited -j
+            # for Make), not the variable
+            print(f"   Using CMAKE_BUILD_PARALLEL_LEVEL={os.environ['CMAKE_BUILD_PARALLEL_LEVEL']}")
         else:
-            # Auto-detect CPU count
+            # Auto-detect the CPUs this process may run on (affinity mask,
+            # cpusets), falling back to the machine's CPU count
             try:
-                import os
+                cpu_count = len(os.sched_getaffinity(0))
+            except AttributeError:
                 cpu_count = os.cpu_count() or 1
-                cmake_args.extend(["--parallel", str(cpu_count)])
-                print(f"   Using {cpu_count} parallel jobs")
-            except:
-                pass
+            cmake_args.extend(["--parallel", str(cpu_count)])
+            print(f"   Using {cpu_count} parallel jobs")
 
         if self.verbose:
             cmake_args.append("--verbose")
@@ -140,10 +231,13 @@ class StaticBuilder:
         print()
 
         try:
+            # Only stderr is shown (on failure), so stdout is discarded rather
+            # than buffered; configure keeps it for the summary
             subprocess.run(
                 cmake_args,
                 check=True,
-                capture_output=not self.verbose
+                stdout=None if self.verbose else subprocess.DEVNULL,
+                stderr=None if self.verbose else subprocess.PIPE
             )
 
             print("\n✓ Build successful\n")
@@ -159,21 +253,31 @@ class StaticBuilder:
         """Find built binaries in build directory"""
         binaries = []
 
-        # Common binary locations
-        search_patterns = [
-            "**/*",  # All files
-        ]
-
-        for pattern in search_patterns:
-            for file in self.build_dir.glob(pattern):
-                if file.is_file() and file.stat().st_mode & 0o111:  # Executable bit
-                    # Skip certain files
-                    if any(skip in file.name.lower() for skip in ["cmake", "test", ".so", ".dylib", ".a"]):
+        # Walk the tree once with os.scandir, pruning CMakeFiles/ (object
+        # files, dependency info) instead of stat()ing all of it
+        stack = [self.build_dir]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != "CMakeFiles":
+                            stack.append(entry.path)
+                        continue
+                    # One stat() answers both "regular file" and "executable bit"
+                    try:
+                        mode = entry.stat().st_mode
+                    except OSError:  # Dangling symlink
                         continue
-                    # Skip if in CMakeFiles directory
-                    if "CMakeFiles" in str(file):
+                    if not stat.S_ISREG(mode) or not mode & 0o111:
+                        continue
+                    # Skip certain files
+                    if _SKIP_RE.search(entry.name):
                         continue
-                    binaries.append(file)
+                    binaries.append(Path(entry.path))
 
         return binaries
 
@@ -195,22 +299,54 @@ class StaticBuilder:
             print(f"✗ Verifier script not found: {verifier_script}")
             return False
 
+        verifier = _load_verifier(verifier_script)
         all_passed = True
 
-        for binary in binaries:
-            print(f"Verifying: {binary.name}")
-            try:
-                result = subprocess.run(
-                    [sys.executable, str(verifier_script), str(binary)],
-                    capture_output=True,
-                    text=True
-                )
+        # Binaries that passed before and have not changed since (same
+        # mtime and size) reuse the cached result
+        cache_path = self.build_dir / _VERIFY_CACHE_NAME
+        fingerprint = _script_digest(verifier_script)
+        cache = _load_verify_cache(cache_path, fingerprint)
+        cache_out = {}
+        results = [None] * len(binaries)
+        stats = {}
 
+        for i, binary in enumerate(binaries):
+            try:
+                st = binary.stat()
+            except OSError:
+                continue
+            key = str(binary)
+            stats[key] = (st.st_mtime_ns, st.st_size)
+            entry = cache.get(key)
+            if entry and (entry.get('mtime_ns'), entry.get('size')) == stats[key]:
+                try:
+                    results[i] = _result_from_json(verifier, entry['result'])
+                    cache_out[key] = entry
+                except (KeyError, TypeError):
+                    pass
+
+        # Verify the rest in-process instead of starting a Python interpreter
+        # per binary, with one ldd/otool run covering them where possible
+        pending = [i for i, result in enumerate(results) if result is None]
+        fresh = verifier.StaticLinkingVerifier.verify_many([binaries[i] for i in pending])
+        for i, result in zip(pending, fresh):
+            results[i] = result
+            key = str(binaries[i])
+            if result.status == verifier.Status.SUCCESS and key in stats:
+                mtime_ns, size = stats[key]
+                cache_out[key] = {'mtime_ns': mtime_ns, 'size': size, 'result': _result_to_json(result)}
+
+        _save_verify_cache(cache_path, fingerprint, cache_out)
+
+        cached = set(range(len(binaries))) - set(pending)
+        for i, (binary, result) in enumerate(zip(binaries, results)):
+            print(f"Verifying: {binary.name}" + (" (cached)" if i in cached else ""))
+            try:
                 # Print output
-                print(result.stdout)
-
-                if result.returncode != 0:
+                if verifier.print_result(result) != 0:
                     all_passed = False
+                print()
 
             except Exception as e:
                 print(f"✗ Error verifying {binary}: {e}\n")
@@ -260,7 +396,8 @@ def main():
     parser.add_argument(
         "-j", "--jobs",
         type=int,
-        help="Number of parallel build jobs"
+        help="Number of parallel build jobs (default: $CMAKE_BUILD_PARALLEL_LEVEL "
+             "if set, otherwise the number of usable CPUs)"
     )
     parser.add_argument(
         "-v", "--verbose",
@@ -11,14 +11,23 @@ Usage:
     python3 verify-static-linking.py --strict build/myapp
 """
 
+import os
+import re
 import sys
 import subprocess
 import platform
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass
 from typing import List, Optional
 from enum import Enum
 
+# Resolved once per process, not per verifier instance
+_PLATFORM = platform.system()
+
+# Slotted dataclasses (no per-instance __dict__) where supported (3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class Status(Enum):
     SUCCESS = "✓"
@@ -26,14 +35,14 @@ class Status(Enum):
     ERROR = "✗"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Dependency:
     name: str
     path: Optional[str] = None
     is_system: bool = False
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class VerificationResult:
     status: Status
     platform: str
@@ -43,135 +52,193 @@ class VerificationResult:
     details: List[str]
 
 
+def _run_tool(args: List[str]) -> subprocess.CompletedProcess:
+    """Run an inspection tool and capture its output through buffered pipes"""
+    return subprocess.run(
+        args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=-1,
+        timeout=10
+    )
+
+
+# Tool output is parsed as raw bytes; only the fields kept in a Dependency are
+# decoded (os.fsdecode, as they are file names). [ \t] keeps a match from
+# running into the next line.
+_LDD_RE = re.compile(rb'^[ \t]*(\S+)[ \t]+=>[ \t]*(\S*)', re.MULTILINE)  # "name => path (addr)"
+_OTOOL_RE = re.compile(rb'^[ \t]+(\S+)', re.MULTILINE)  # "\tpath (compatibility ...)"
+
+# System libraries: distro library directories plus the vDSO and the dynamic
+# loader on Linux, the core DLLs on Windows
+_LINUX_SYSLIB_RE = re.compile(r'^(?:/lib/|/lib64/|/usr/lib/|/usr/lib64/)|linux-vdso|ld-linux')
+_WIN_SYSDLL_RE = re.compile(rb'^(?:kernel32|ntdll|msvcrt|ucrtbase|advapi32|user32)', re.IGNORECASE)
+
+
+def _parse_ldd_section(output: bytes) -> List[Dependency]:
+    """Parse the "name => path" lines ldd prints for one binary"""
+    deps = []
+    for match in _LDD_RE.finditer(output):
+        lib_name = os.fsdecode(match.group(1))
+        lib_path = os.fsdecode(match.group(2)) if match.group(2) else None
+
+        # Check if system library
+        is_system = bool(lib_path and _LINUX_SYSLIB_RE.search(lib_path))
+
+        deps.append(Dependency(
+            name=lib_name,
+            path=lib_path,
+            is_system=is_system
+        ))
+    return deps
+
+
+def _parse_otool_section(output: bytes) -> List[Dependency]:
+    """Parse the indented install-name lines otool -L prints for one binary"""
+    deps = []
+    for match in _OTOOL_RE.finditer(output):
+        lib_path = os.fsdecode(match.group(1))
+
+        # Categorize
+        is_system = (
+            lib_path.startswith("/usr/lib/") or
+            lib_path.startswith("/System/Library/")
+        )
+
+        deps.append(Dependency(
+            name=Path(lib_path).name,
+            path=lib_path,
+            is_system=is_system
+        ))
+    return deps
+
+
+def _split_sections(output: bytes, binaries: List[str]) -> Optional[List[bytes]]:
+    """Split multi-file ldd/otool output at the "<binary>:" header lines
+
+    Returns one block of text per binary, or None when a header is missing.
+    """
+    headers = [os.fsencode(binary) + b":" for binary in binaries]
+    sections: List[List[bytes]] = []
+    for line in output.splitlines():
+        if len(sections) < len(headers) and line == headers[len(sections)]:
+            sections.append([])
+        elif sections:
+            sections[-1].append(line)
+
+    if len(sections) != len(headers):
+        return None
+    return [b"\n".join(section) for section in sections]
+
+
 class StaticLinkingVerifier:
     """Verifies static linking for different platforms"""
 
     def __init__(self, binary_path: Path, strict: bool = False):
         self.binary = binary_path
         self.strict = strict
-        self.platform = platform.system()
+        self.platform = _PLATFORM
 
     def verify(self) -> VerificationResult:
         """Main verification method"""
-        if not self.binary.exists():
+        problem = self._check_binary()
+        if problem:
+            return problem
+
+        # Platform-specific verification
+        verify_platform = _VERIFIERS.get(self.platform)
+        if verify_platform is None:
             return VerificationResult(
                 status=Status.ERROR,
                 platform=self.platform,
                 binary=self.binary,
                 dependencies=[],
-                message=f"Binary not found: {self.binary}",
+                message=f"Unsupported platform: {self.platform}",
                 details=[]
             )
-
-        if not self.binary.is_file():
+        return verify_platform(self)
+
+    @classmethod
+    def verify_many(cls, binaries: List[Path], strict: bool = False) -> List[VerificationResult]:
+        """Verify several binaries with a single ldd/otool run
+
+        Both tools accept multiple files and label each one's output with a
+        "path:" header line. Anything the batch cannot settle (Windows, a
+        missing tool, output that does not split cleanly) is verified one by
+        one instead. Results are returned in the order of binaries.
+        """
+        verifiers = [cls(binary, strict=strict) for binary in binaries]
+        results: List[Optional[VerificationResult]] = [v._check_binary() for v in verifiers]
+        pending = [i for i, result in enumerate(results) if result is None]
+
+        # ldd omits the header line for a single file
+        if len(pending) > 1 and _PLATFORM in _BATCH_TOOLS:
+            tool, evaluate = _BATCH_TOOLS[_PLATFORM]
+            args = [str(verifiers[i].binary) for i in pending]
+            try:
+                # Merge stderr so messages stay next to their file's header
+                run = subprocess.run(
+                    [*tool, *args],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    bufsize=-1,
+                    timeout=10 * len(args)
+                )
+                # otool reports per-file failures only through its exit code
+                sections = _split_sections(run.stdout, args) if tool[0] == "ldd" or run.returncode == 0 else None
+            except (OSError, subprocess.SubprocessError):
+                sections = None
+
+            if sections:
+                for i, section in zip(pending, sections):
+                    try:
+                        results[i] = evaluate(verifiers[i], section)
+                    except Exception:
+                        pass  # Retried alone below for the exact error
+
+        # One process per binary for whatever is left
+        leftover = [i for i, result in enumerate(results) if result is None]
+        if leftover:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                for i, result in zip(leftover, executor.map(lambda i: verifiers[i].verify(), leftover)):
+                    results[i] = result
+
+        return results
+
+    def _check_binary(self) -> Optional[VerificationResult]:
+        """Return an error result if the binary cannot be inspected at all"""
+        if not self.binary.exists():
             return VerificationResult(
                 status=Status.ERROR,
                 platform=self.platform,
                 binary=self.binary,
                 dependencies=[],
-                message=f"Not a file: {self.binary}",
+                message=f"Binary not found: {self.binary}",
                 details=[]
             )
 
-        # Platform-specific verification
-        if self.platform == "Linux":
-            return self._verify_linux()
-        elif self.platform == "Darwin":
-            return self._verify_macos()
-        elif self.platform == "Windows":
-            return self._verify_windows()
-        else:
+        if not self.binary.is_file():
             return VerificationResult(
                 status=Status.ERROR,
                 platform=self.platform,
                 binary=self.binary,
                 dependencies=[],
-                message=f"Unsupported platform: {self.platform}",
+                message=f"Not a file: {self.binary}",
                 details=[]
             )
 
+        return None
+
     def _verify_linux(self) -> VerificationResult:
         """Verify Linux binary with ldd"""
         try:
-            result = subprocess.run(
-                ["ldd", str(self.binary)],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            output = result.stdout + result.stderr
-
-            # Check if fully static
-            if "not a dynamic executable" in output or "not a dynamic" in output:
-                return VerificationResult(
-                    status=Status.SUCCESS,
-                    platform="Linux",
-                    binary=self.binary,
-                    dependencies=[],
-                    message="Fully static binary (no dynamic dependencies)",
-                    details=["Binary is completely static", "No shared libraries linked"]
-                )
+            result = _run_tool(["ldd", str(self.binary)])
 
-            # Parse dependencies
-            deps = []
-            for line in output.splitlines():
-                line = line.strip()
-                if "=>" in line:
-                    parts = line.split("=>")
-                    lib_name = parts[0].strip()
-                    lib_path = parts[1].strip().split()[0] if len(parts[1].strip()) > 0 else None
-
-                    # Check if system library
-                    is_system = False
-                    if lib_path and any(p in lib_path for p in ["/lib/", "/usr/lib/", "linux-vdso", "ld-linux"]):
-                        is_system = True
-
-                    deps.append(Dependency(
-                        name=lib_name,
-                        path=lib_path,
-                        is_system=is_system
-                    ))
+            # ldd reports static binaries on stderr, stdout is not needed then
+            if b"not a dynamic" in result.stderr:
+                return self._linux_static_result()
 
-            # Evaluate
-            if not deps:
-                return VerificationResult(
-                    status=Status.SUCCESS,
-                    platform="Linux",
-                    binary=self.binary,
-                    dependencies=[],
-                    message="Fully static binary",
-                    details=["No dynamic dependencies found"]
-                )
-
-            # Only system libs (linux-vdso, ld-linux)
-            non_system_deps = [d for d in deps if not d.is_system]
-            if not non_system_deps:
-                status = Status.WARNING if self.strict else Status.SUCCESS
-                return VerificationResult(
-                    status=status,
-                    platform="Linux",
-                    binary=self.binary,
-                    dependencies=deps,
-                    message="Mostly static (only system libs)" if not self.strict else "Not fully static",
-                    details=[
-                        f"System dependencies: {len(deps)}",
-                        "All dependencies are system libraries"
-                    ]
-                )
-
-            # Has non-system dependencies
-            return VerificationResult(
-                status=Status.ERROR,
-                platform="Linux",
-                binary=self.binary,
-                dependencies=deps,
-                message=f"Dynamic binary with {len(non_system_deps)} non-system dependencies",
-                details=[
-                    f"Total dependencies: {len(deps)}",
-                    f"Non-system dependencies: {len(non_system_deps)}"
-                ]
-            )
+            return self._linux_result(result.stdout + result.stderr)
 
         except FileNotFoundError:
             return VerificationResult(
@@ -192,15 +259,69 @@ class StaticLinkingVerifier:
                 details=[]
             )
 
+    def _linux_static_result(self) -> VerificationResult:
+        """Result for a binary that ldd reports as not dynamic"""
+        return VerificationResult(
+            status=Status.SUCCESS,
+            platform="Linux",
+            binary=self.binary,
+            dependencies=[],
+            message="Fully static binary (no dynamic dependencies)",
+            details=["Binary is completely static", "No shared libraries linked"]
+        )
+
+    def _linux_result(self, output: bytes) -> VerificationResult:
+        """Evaluate the ldd output of this binary"""
+        # Check if fully static ("not a dynamic executable")
+        if b"not a dynamic" in output:
+            return self._linux_static_result()
+
+        deps = _parse_ldd_section(output)
+
+        # Evaluate
+        if not deps:
+            return VerificationResult(
+                status=Status.SUCCESS,
+                platform="Linux",
+                binary=self.binary,
+                dependencies=[],
+                message="Fully static binary",
+                details=["No dynamic dependencies found"]
+            )
+
+        # Only system libs (linux-vdso, ld-linux)
+        non_system_deps = [d for d in deps if not d.is_system]
+        if not non_system_deps:
+            status = Status.WARNING if self.strict else Status.SUCCESS
+            return VerificationResult(
+                status=status,
+                platform="Linux",
+                binary=self.binary,
+                dependencies=deps,
+                message="Mostly static (only system libs)" if not self.strict else "Not fully static",
+                details=[
+                    f"System dependencies: {len(deps)}",
+                    "All dependencies are system libraries"
+                ]
+            )
+
+        # Has non-system dependencies
+        return VerificationResult(
+            status=Status.ERROR,
+            platform="Linux",
+            binary=self.binary,
+            dependencies=deps,
+            message=f"Dynamic binary with {len(non_system_deps)} non-system dependencies",
+            details=[
+                f"Total dependencies: {len(deps)}",
+                f"Non-system dependencies: {len(non_system_deps)}"
+            ]
+        )
+
     def _verify_macos(self) -> VerificationResult:
         """Verify macOS binary with otool"""
         try:
-            result = subprocess.run(
-                ["otool", "-L", str(self.binary)],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            result = _run_tool(["otool", "-L", str(self.binary)])
 
             if result.returncode != 0:
                 return VerificationResult(
@@ -208,93 +329,13 @@ class StaticLinkingVerifier:
                     platform="macOS",
                     binary=self.binary,
                     dependencies=[],
-                    message=f"otool failed: {result.stderr}",
-                    details=[]
-                )
-
-            lines = result.stdout.strip().splitlines()
-
-            # Skip first line (binary path itself)
-            if len(lines) <= 1:
-                return VerificationResult(
-                    status=Status.SUCCESS,
-                    platform="macOS",
-                    binary=self.binary,
-                    dependencies=[],
-                    message="No dependencies (unusual but valid)",
+                    message=f"otool failed: {os.fsdecode(result.stderr)}",
                     details=[]
                 )
 
-            deps = []
-            for line in lines[1:]:
-                lib_path = line.strip().split()[0]
-
-                # Categorize
-                is_system = (
-                    lib_path.startswith("/usr/lib/") or
-                    lib_path.startswith("/System/Library/")
-                )
-
-                deps.append(Dependency(
-                    name=Path(lib_path).name,
-                    path=lib_path,
-                    is_system=is_system
-                ))
-
-            # Check if only libSystem.B.dylib
-            if len(deps) == 1 and "/usr/lib/libSystem.B.dylib" in deps[0].path:
-                return VerificationResult(
-                    status=Status.SUCCESS,
-                    platform="macOS",
-                    binary=self.binary,
-                    dependencies=deps,
-                    message="Optimal static binary (only libSystem required by macOS)",
-                    details=[
-                        "Only system library: libSystem.B.dylib",
-                        "Third-party libraries are statically linked"
-                    ]
-                )
-
-            # Only system libraries
-            non_system_deps = [d for d in deps if not d.is_system]
-            if not non_system_deps:
-                if len(deps) <= 3:
-                    return VerificationResult(
-                        status=Status.SUCCESS,
-                        platform="macOS",
-                        binary=self.binary,
-                        dependencies=deps,
-                        message="Good static binary (only system libs)",
-                        details=[
-                            f"System dependencies: {len(deps)}",
-                            "All dependencies are system libraries"
-                        ]
-                    )
-                else:
-                    return VerificationResult(
-                        status=Status.WARNING,
-                        platform="macOS",
-                        binary=self.binary,
-                        dependencies=deps,
-                        message=f"Many system dependencies ({len(deps)})",
-                        details=[
-                            f"System dependencies: {len(deps)}",
-                            "Consider reviewing dependencies"
-                        ]
-                    )
-
-            # Has non-system dependencies
-            return VerificationResult(
-                status=Status.ERROR,
-                platform="macOS",
-                binary=self.binary,
-                dependencies=deps,
-                message=f"Dynamic binary with {len(non_system_deps)} third-party dependencies",
-                details=[
-                    f"Total dependencies: {len(deps)}",
-                    f"Non-system dependencies: {len(non_system_deps)}"
-                ]
-            )
+            # Drop the first line (binary path itself) so the section has the
+            # same shape as in verify_many()
+            return self._macos_result(result.stdout.partition(b"\n")[2])
 
         except FileNotFoundError:
             return VerificationResult(
@@ -315,16 +356,86 @@ class StaticLinkingVerifier:
                 details=[]
             )
 
+    def _macos_result(self, output: bytes) -> VerificationResult:
+        """Evaluate the otool -L dependency lines of this binary"""
+        # Fast path for the usual well-linked binary, whose only line is
+        # "\t/usr/lib/libSystem.B.dylib (compatibility version ...)"
+        line = output.strip(b"\r\n")
+        if b"\n" not in line and line[:1] in (b"\t", b" ") and line.split(None, 1)[:1] == [b"/usr/lib/libSystem.B.dylib"]:
+            deps = [Dependency(name="libSystem.B.dylib", path="/usr/lib/libSystem.B.dylib", is_system=True)]
+        else:
+            deps = _parse_otool_section(output)
+
+        if not deps:
+            return VerificationResult(
+                status=Status.SUCCESS,
+                platform="macOS",
+                binary=self.binary,
+                dependencies=[],
+                message="No dependencies (unusual but valid)",
+                details=[]
+            )
+
+        # Check if only libSystem.B.dylib
+        if len(deps) == 1 and "/usr/lib/libSystem.B.dylib" in deps[0].path:
+            return VerificationResult(
+                status=Status.SUCCESS,
+                platform="macOS",
+                binary=self.binary,
+                dependencies=deps,
+                message="Optimal static binary (only libSystem required by macOS)",
+                details=[
+                    "Only system library: libSystem.B.dylib",
+                    "Third-party libraries are statically linked"
+                ]
+            )
+
+        # Only system libraries
+        non_system_deps = [d for d in deps if not d.is_system]
+        if not non_system_deps:
+            if len(deps) <= 3:
+                return VerificationResult(
+                    status=Status.SUCCESS,
+                    platform="macOS",
+                    binary=self.binary,
+                    dependencies=deps,
+                    message="Good static binary (only system libs)",
+                    details=[
+                        f"System dependencies: {len(deps)}",
+                        "All dependencies are system libraries"
+                    ]
+                )
+            else:
+                return VerificationResult(
+                    status=Status.WARNING,
+                    platform="macOS",
+                    binary=self.binary,
+                    dependencies=deps,
+                    message=f"Many system dependencies ({len(deps)})",
+                    details=[
+                        f"System dependencies: {len(deps)}",
+                        "Consider reviewing dependencies"
+                    ]
+                )
+
+        # Has non-system dependencies
+        return VerificationResult(
+            status=Status.ERROR,
+            platform="macOS",
+            binary=self.binary,
+            dependencies=deps,
+            message=f"Dynamic binary with {len(non_system_deps)} third-party dependencies",
+            details=[
+                f"Total dependencies: {len(deps)}",
+                f"Non-system dependencies: {len(non_system_deps)}"
+            ]
+        )
+
     def _verify_windows(self) -> VerificationResult:
         """Verify Windows binary with dumpbin"""
         try:
             # Try dumpbin first (Visual Studio)
-            result = subprocess.run(
-                ["dumpbin", "/dependents", str(self.binary)],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            result = _run_tool(["dumpbin", "/dependents", str(self.binary)])
 
             if result.returncode != 0:
                 return VerificationResult(
@@ -341,16 +452,14 @@ class StaticLinkingVerifier:
             in_deps_section = False
             for line in result.stdout.splitlines():
                 line = line.strip()
-                if "Image has the following dependencies:" in line:
+                if b"Image has the following dependencies:" in line:
                     in_deps_section = True
                     continue
-                if in_deps_section and line and not line.startswith("Summary"):
-                    if line.endswith(".dll"):
-                        is_system = any(sys_dll in line.lower() for sys_dll in [
-                            "kernel32", "ntdll", "msvcrt", "ucrtbase"
-                        ])
+                if in_deps_section and line and not line.startswith(b"Summary"):
+                    if line.endswith(b".dll"):
+                        is_system = bool(_WIN_SYSDLL_RE.match(line))
                         deps.append(Dependency(
-                            name=line,
+                            name=os.fsdecode(line),
                             path=None,
                             is_system=is_system
                         ))
@@ -413,6 +522,19 @@ class StaticLinkingVerifier:
             )
 
 
+# Tools that take many files at once, with the evaluator for one file's section
+_BATCH_TOOLS = {
+    "Linux": (["ldd"], StaticLinkingVerifier._linux_result),
+    "Darwin": (["otool", "-L"], StaticLinkingVerifier._macos_result),
+}
+
+_VERIFIERS = {
+    "Linux": StaticLinkingVerifier._verify_linux,
+    "Darwin": StaticLinkingVerifier._verify_macos,
+    "Windows": StaticLinkingVerifier._verify_windows,
+}
+
+
 def print_result(result: VerificationResult, verbose: bool = False):
     """Pretty print verification result"""
     print(f"\n{'=' * 80}")